@@ -1,3 +1,5 @@
+from pyspark.sql.types import StructType, StructField, StringType, IntegerType, DoubleType
+
 CATALOG = "ecom_lakehouse"
 SCHEMA_LANDING = "files"
 SCHEMA_BRONZE = "bronze"
@@ -28,4 +30,39 @@ SILVER_TABLES = {
     "payments":  f"{CATALOG}.{SCHEMA_SILVER}.payments",
     "products":  f"{CATALOG}.{SCHEMA_SILVER}.products",
     "order_items": f"{CATALOG}.{SCHEMA_SILVER}.order_items",   
-}
\ No newline at end of file
+}
+
+# Esquemas de los CSV de landing (mismo orden de columnas que el generador).
+# Importes y cantidades tipados; el resto, fechas y columnas CDC como STRING.
+# "dt" es la columna de partición de la carpeta de landing.
+def _schema(*cols):
+    return StructType([StructField(name, dtype, True) for name, dtype in cols])
+
+_CDC_COLS = [("op", StringType()), ("eventTime", StringType()), ("seqNum", IntegerType()), ("dt", StringType())]
+
+SCHEMAS = {
+    "customers": _schema(
+        ("customerId", StringType()), ("firstName", StringType()), ("lastName", StringType()),
+        ("emailAddress", StringType()), ("phoneNumber", StringType()), ("customerSince", StringType()),
+        ("isActive", StringType()), ("extraField1", StringType()), *_CDC_COLS,
+    ),
+    "orders": _schema(
+        ("orderId", StringType()), ("customerId", StringType()), ("orderDate", StringType()),
+        ("shipDate", StringType()), ("status", StringType()), ("shippingAddress", StringType()),
+        ("totalAmount", DoubleType()), ("extraField1", StringType()), *_CDC_COLS,
+    ),
+    "payments": _schema(
+        ("paymentId", StringType()), ("orderId", StringType()), ("paymentMethod", StringType()),
+        ("amount", DoubleType()), ("paymentDate", StringType()), ("status", StringType()), *_CDC_COLS,
+    ),
+    "products": _schema(
+        ("productId", StringType()), ("productName", StringType()), ("category", StringType()),
+        ("unitPrice", DoubleType()), ("currency", StringType()), ("productReleaseDate", StringType()),
+        ("isDiscontinued", StringType()), ("extraField2", StringType()), *_CDC_COLS,
+    ),
+    "order_items": _schema(
+        ("orderItemId", StringType()), ("orderId", StringType()), ("productId", StringType()),
+        ("quantity", IntegerType()), ("unitPrice", DoubleType()), ("lineAmount", DoubleType()),
+        ("currency", StringType()), ("holaMundo", StringType()), *_CDC_COLS,
+    ),
+}
@@ -2,12 +2,13 @@
 """
 Messy e-commerce generator with CDC (Raw -> Bronze -> Silver -> Gold)
 
-Tables emitted per day (CSV under ./data/raw/YYYY-MM-DD/):
+Tables emitted per day (CSV and/or Parquet under ./data/raw/YYYY-MM-DD/):
   - customers.csv
   - products.csv
   - orders.csv
   - orderItems.csv
   - payments.csv (optional with --include-payments)
+  (plus a .parquet sidecar per table unless --format csv)
 
 Features to clean later:
   - camelCase headers (e.g., orderDate, productReleaseDate, holaMundo)
@@ -19,292 +20,501 @@ Features to clean later:
 
 Star schema (Gold idea):
   - dim_customer, dim_product, dim_date, fact_order_item
+
+Requires numpy (randomness is drawn per column, not per row) and pyarrow for
+Parquet output.
 """
 
 import argparse
-import csv
+import itertools
 import os
-import random
-import string
-import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for --format parquet/both
+    pa = pq = None
+
+# ----------------------------- Tables -----------------------------
+# Tables are columnar: column name -> list of values. Sampling is an index
+# gather and appending is a per-column extend, so no row objects are built.
+# Numeric columns (quantity, prices/amounts, seqNum) are numpy arrays of a
+# native dtype; NULL is NaN in float columns and 0 in integer ones.
+
+Column = Union[List[Any], np.ndarray]
+Table = Dict[str, Column]
+
+CDC_COLUMNS = ["op","eventTime","seqNum"]
+
+# CSV file name (without .csv) -> header
+FIELDNAMES = {
+    "customers": ["customerId","firstName","lastName","emailAddress","phoneNumber","customerSince","isActive",
+                  "extraField1"] + CDC_COLUMNS,
+    "products": ["productId","productName","category","unitPrice","currency","productReleaseDate","isDiscontinued",
+                 "extraField2"] + CDC_COLUMNS,
+    "orders": ["orderId","customerId","orderDate","shipDate","status","shippingAddress","totalAmount",
+               "extraField1"] + CDC_COLUMNS,
+    "orderItems": ["orderItemId","orderId","productId","quantity","unitPrice","lineAmount","currency",
+                   "holaMundo"] + CDC_COLUMNS,
+    "payments": ["paymentId","orderId","paymentMethod","amount","paymentDate","status"] + CDC_COLUMNS,
+}
+
+def table_len(table: Table) -> int:
+    return len(next(iter(table.values()))) if table else 0
+
+def _take(values: Column, idx: List[int]) -> Column:
+    return values[idx] if isinstance(values, np.ndarray) else [values[i] for i in idx]
+
+def take(table: Table, idx: List[int]) -> Table:
+    return {c: _take(values, idx) for c, values in table.items()}
+
+def extend_table(table: Table, other: Table) -> None:
+    # lists grow in place, O(len(other)); numeric arrays are re-concatenated,
+    # which is a plain memcpy of a few bytes per row
+    for c, values in table.items():
+        if isinstance(values, np.ndarray):
+            table[c] = np.concatenate([values, other[c]])
+        else:
+            values.extend(other[c])
 
 # ----------------------------- Helpers -----------------------------
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
-def rand_choice_weighted(options: List[str], weights: Optional[List[float]] = None) -> str:
-    return random.choices(options, weights=weights, k=1)[0]
-
-def maybe_null(value: Any, null_rate: float) -> Any:
-    return None if random.random() < null_rate else value
-
-def maybe_pad_spaces(value: Optional[str], prob: float = 0.2) -> Optional[str]:
-    if value is None:
-        return value
-    if random.random() < prob:
-        left = " " * random.randint(0, 2)
-        right = " " * random.randint(0, 2)
-        return f"{left}{value}{right}"
-    return value
-
-def random_name() -> Tuple[str, str]:
-    firsts = ["Ana","Luis","María","Juan","Lucía","Carlos","Sofía","Pablo","Laura","Miguel","Marta","Javier"]
-    lasts  = ["García","López","Martínez","Sánchez","González","Rodríguez","Fernández","Pérez","Gómez","Díaz"]
-    return random.choice(firsts), random.choice(lasts)
-
-def random_email(first: str, last: str) -> str:
-    domains = ["example.com","mail.com","correo.es","test.org"]
-    sep = random.choice([".","_","","-"])
-    return f"{first.lower()}{sep}{last.lower()}@{random.choice(domains)}"
-
-def random_category() -> str:
+def _uuid_pool(batch: int = 4096) -> Iterator[str]:
+    # uuid4-shaped ids from one os.urandom call per batch (no uuid.UUID objects)
+    while True:
+        raw = bytearray(os.urandom(16 * batch))
+        for i in range(6, 16 * batch, 16):
+            raw[i] = raw[i] & 0x0F | 0x40          # version 4
+            raw[i + 2] = raw[i + 2] & 0x3F | 0x80  # RFC 4122 variant
+        h = raw.hex()
+        for i in range(0, 32 * batch, 32):
+            yield "%s-%s-%s-%s-%s" % (h[i:i+8], h[i+8:i+12], h[i+12:i+16], h[i+16:i+20], h[i+20:i+32])
+
+UUID_POOL = _uuid_pool()
+
+# Orphan FKs only need to miss the parent table: random prefix + counter, no CSPRNG per id
+_ORPHAN_PREFIX = os.urandom(8).hex()
+_orphan_counter = itertools.count()
+
+def orphan_id() -> str:
+    return f"{_ORPHAN_PREFIX}{next(_orphan_counter):024x}"
+
+class WeightedSampler:
+    """Categorical sampler whose cumulative weights are computed once, not per draw."""
+
+    def __init__(self, options: List[Any], weights: Optional[List[float]] = None):
+        self.options = options
+        self.cdf = np.cumsum(weights if weights is not None else [1.0] * len(options))
+        self.total = float(self.cdf[-1])
+
+    def sample(self, rng: np.random.Generator, n: int) -> List[Any]:
+        idx = np.searchsorted(self.cdf, rng.random(n) * self.total, side="right")
+        return [self.options[i] for i in idx.tolist()]
+
+_PADS = np.array(["", " ", "  "], dtype=object)
+
+def null_out(rng: np.random.Generator, values: Column, null_rate: float) -> Column:
+    if isinstance(values, np.ndarray):
+        null = np.nan if values.dtype.kind == "f" else 0
+        return np.where(rng.random(len(values)) < null_rate, null, values).astype(values.dtype)
+    vals = np.empty(len(values), dtype=object)
+    vals[:] = values
+    return np.where(rng.random(len(vals)) < null_rate, None, vals).tolist()
+
+def pad_spaces(rng: np.random.Generator, values: List[Optional[str]], prob: float = 0.2) -> List[Optional[str]]:
+    # branchless: unpadded rows get "" on both sides, NULLs are left untouched
+    n = len(values)
+    pad = rng.random(n) < prob
+    left = np.where(pad, rng.integers(0, 3, n), 0)
+    right = np.where(pad, rng.integers(0, 3, n), 0)
+    vals = np.empty(n, dtype=object)
+    vals[:] = values
+    keep = vals != None  # elementwise
+    vals[keep] = _PADS[left[keep]] + vals[keep] + _PADS[right[keep]]
+    return vals.tolist()
+
+# Name tables and their case variants are built once, not per row
+FIRSTS = ["Ana","Luis","María","Juan","Lucía","Carlos","Sofía","Pablo","Laura","Miguel","Marta","Javier"]
+LASTS  = ["García","López","Martínez","Sánchez","González","Rodríguez","Fernández","Pérez","Gómez","Díaz"]
+FIRSTS_LOWER = [s.lower() for s in FIRSTS]
+FIRSTS_UPPER = [s.upper() for s in FIRSTS]
+LASTS_LOWER = [s.lower() for s in LASTS]
+DOMAINS = ["example.com","mail.com","correo.es","test.org"]
+SEPS = [".","_","","-"]
+
+def random_names(rng: np.random.Generator, n: int) -> Tuple[List[int], List[int]]:
+    # indices into FIRSTS / LASTS
+    return rng.integers(0, len(FIRSTS), n).tolist(), rng.integers(0, len(LASTS), n).tolist()
+
+def random_email(fi: int, li: int, di: int, si: int) -> str:
+    return f"{FIRSTS_LOWER[fi]}{SEPS[si]}{LASTS_LOWER[li]}@{DOMAINS[di]}"
+
+def random_emails(rng: np.random.Generator, fi: List[int], li: List[int]) -> List[str]:
+    n = len(fi)
+    di = rng.integers(0, len(DOMAINS), n).tolist()
+    si = rng.integers(0, len(SEPS), n).tolist()
+    return list(map(random_email, fi, li, di, si))
+
+def random_categories(rng: np.random.Generator, n: int) -> List[str]:
     # deliberately inconsistent
     cats = ["electronics","Electronics","Electrónica","home","Hogar","sports","Sports","Juguetes","toys"]
-    return random.choice(cats)
-
-def random_product_name(category: str) -> str:
-    base = {
-        "electronics": ["Headphones","Smartphone","Tablet","Camera","Monitor","Keyboard"],
-        "home": ["Lamp","Vacuum","Blender","Toaster","Air Purifier","Kettle"],
-        "sports": ["Football","Basketball","Tennis Racket","Yoga Mat","Cycling Helmet"],
-        "toys": ["Board Game","Doll","Action Figure","Puzzle","Lego Set"],
-        "Electronics": ["Bluetooth Speaker","Smartwatch","Webcam","Printer"],
-        "Hogar": ["Sartén","Cacerola","Cafetera","Plancha"],
-        "Sports": ["Running Shoes","Gym Bag","Skipping Rope"],
-        "Juguetes": ["Coche Teledirigido","Peluche","Pinturas"]
-    }
-    k = category if category in base else random.choice(list(base.keys()))
-    return random.choice(base[k])
-
-def random_date(start: datetime, end: datetime) -> datetime:
-    delta = end - start
-    if delta.total_seconds() <= 0:
-        return start
-    offset = random.randint(0, int(delta.total_seconds()))
-    return start + timedelta(seconds=offset)
-
-def write_csv(path: str, rows: List[Dict[str, Any]], fieldnames: List[str]) -> None:
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-
-def duplicate_rows(rows: List[Dict[str, Any]], dupe_rate: float) -> List[Dict[str, Any]]:
-    if dupe_rate <= 0: return rows
-    dupes = []
-    for r in rows:
-        if random.random() < dupe_rate:
-            dupes.append(r.copy())
-    return rows + dupes
-
-def rand_phone() -> str:
-    return "".join(random.choices(string.digits, k=9))
-
-def day_event_time(file_date: datetime.date) -> datetime:
-    return datetime.combine(file_date, datetime.min.time()) + timedelta(seconds=random.randint(0, 86399))
+    return [cats[i] for i in rng.integers(0, len(cats), n).tolist()]
+
+PRODUCT_BASE = {
+    "electronics": ["Headphones","Smartphone","Tablet","Camera","Monitor","Keyboard"],
+    "home": ["Lamp","Vacuum","Blender","Toaster","Air Purifier","Kettle"],
+    "sports": ["Football","Basketball","Tennis Racket","Yoga Mat","Cycling Helmet"],
+    "toys": ["Board Game","Doll","Action Figure","Puzzle","Lego Set"],
+    "Electronics": ["Bluetooth Speaker","Smartwatch","Webcam","Printer"],
+    "Hogar": ["Sartén","Cacerola","Cafetera","Plancha"],
+    "Sports": ["Running Shoes","Gym Bag","Skipping Rope"],
+    "Juguetes": ["Coche Teledirigido","Peluche","Pinturas"]
+}
+PRODUCT_BASE_KEYS = list(PRODUCT_BASE.keys())
+PRODUCT_BASE_INDEX = {k: i for i, k in enumerate(PRODUCT_BASE_KEYS)}
+
+def random_product_names(rng: np.random.Generator, categories: List[str]) -> List[str]:
+    # categories without a name list borrow a random one; names are then drawn per category group
+    ki = np.array([PRODUCT_BASE_INDEX.get(c, -1) for c in categories], dtype=np.int64)
+    missing = ki < 0
+    ki[missing] = rng.integers(0, len(PRODUCT_BASE_KEYS), int(missing.sum()))
+    names = np.empty(len(categories), dtype=object)
+    for k, key in enumerate(PRODUCT_BASE_KEYS):
+        rows = np.flatnonzero(ki == k)
+        choices = np.array(PRODUCT_BASE[key], dtype=object)
+        names[rows] = choices[rng.integers(0, len(choices), len(rows))]
+    return names.tolist()
+
+def random_dates(rng: np.random.Generator, start: datetime, end: datetime, n: int) -> np.ndarray:
+    span = max(0, int((end - start).total_seconds()))
+    return np.datetime64(start, "s") + rng.integers(0, span + 1, n).astype("timedelta64[s]")
+
+def fmt_dates(ts: np.ndarray) -> List[str]:
+    return np.datetime_as_string(ts, unit="D").tolist()
+
+def fmt_timestamps(ts: np.ndarray) -> List[str]:
+    return [t.replace("T", " ") for t in np.datetime_as_string(ts, unit="s").tolist()]
+
+_CSV_SPECIAL = (",", '"', "\r", "\n")
+
+def _numeric_column(values: np.ndarray) -> List[str]:
+    # one vectorized format call per column; NaN / 0 are written as empty (NULL)
+    if values.dtype.kind == "f":
+        return np.where(np.isnan(values), "", np.char.mod("%.2f", values)).tolist()
+    return np.where(values == 0, "", np.char.mod("%d", values)).tolist()
+
+def _csv_column(values: Column) -> List[str]:
+    if isinstance(values, np.ndarray):
+        return _numeric_column(values)
+    col = ["" if v is None else str(v) for v in values]
+    # one scan per column; only columns that can hold a comma/quote pay for per-value quoting
+    blob = "\0".join(col)
+    if any(c in blob for c in _CSV_SPECIAL):
+        col = ['"' + v.replace('"', '""') + '"' if any(c in v for c in _CSV_SPECIAL) else v for v in col]
+    return col
+
+def write_csv(path: str, table: Table, fieldnames: List[str]) -> None:
+    # Same bytes as csv.writer (QUOTE_MINIMAL, \r\n), but rows are joined directly from
+    # per-column strings instead of going through the writer's per-field quoting checks.
+    cols = [_csv_column(table[c]) for c in fieldnames]
+    with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(",".join(fieldnames) + "\r\n")
+        f.writelines([",".join(r) + "\r\n" for r in zip(*cols)])
+
+def _arrow_column(values: Column) -> "pa.Array":
+    # numeric arrays keep their dtype (NaN / 0 -> null); everything else is text, as in the CSV
+    if isinstance(values, np.ndarray):
+        return pa.array(values, mask=np.isnan(values) if values.dtype.kind == "f" else values == 0)
+    return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+def write_parquet(path: str, table: Table, fieldnames: List[str]) -> None:
+    tbl = pa.table({c: _arrow_column(table[c]) for c in fieldnames})
+    pq.write_table(tbl, path, compression="zstd", use_dictionary=True)
+
+def write_table(out_dir: str, name: str, table: Table, fmt: str) -> None:
+    stem = os.path.join(out_dir, name)
+    if fmt in ("csv", "both"):
+        write_csv(f"{stem}.csv", table, FIELDNAMES[name])
+    if fmt in ("parquet", "both"):
+        write_parquet(f"{stem}.parquet", table, FIELDNAMES[name])
+
+def duplicate_rows(rng: np.random.Generator, table: Table, dupe_rate: float) -> Table:
+    if dupe_rate <= 0: return table
+    dupes = np.flatnonzero(rng.random(table_len(table)) < dupe_rate).tolist()
+    return take(table, list(range(table_len(table))) + dupes)
+
+def rand_phones(rng: np.random.Generator, n: int) -> List[str]:
+    return [f"{x:09d}" for x in rng.integers(0, 10**9, n).tolist()]
+
+def day_event_time_str(rng: np.random.Generator, file_date: datetime.date, n: int,
+                       late_rate: float = 0.0) -> List[str]:
+    # "YYYY-MM-DD HH:MM:SS" built from integer h/m/s; late rows move 1-2 days back
+    h, rem = np.divmod(rng.integers(0, 86400, n), 3600)
+    m, sec = np.divmod(rem, 60)
+    days_back = np.zeros(n, dtype=np.int64)
+    if late_rate > 0:
+        days_back = np.where(rng.random(n) < late_rate, rng.integers(1, 3, n), 0)
+    prefixes = [f"{file_date - timedelta(days=d)} " for d in range(3)]
+    return [f"{prefixes[d]}{hh:02d}:{mm:02d}:{ss:02d}"
+            for d, hh, mm, ss in zip(days_back.tolist(), h.tolist(), m.tolist(), sec.tolist())]
+
+# ----------------------------- Samplers -----------------------------
+
+ACTIVE_SAMPLER = WeightedSampler(["Y","N","y","n"], [0.7,0.1,0.15,0.05])
+CUSTOMER_EXTRA_SAMPLER = WeightedSampler(["", "N/A", "legacy", None], [0.5,0.2,0.2,0.1])
+PRODUCT_CURRENCY_SAMPLER = WeightedSampler(["EUR","eur","Usd","USD"], [0.7,0.05,0.1,0.15])
+DISCONTINUED_SAMPLER = WeightedSampler(["Y","N","NO","yes"], [0.05,0.8,0.1,0.05])
+DISCONTINUED_UPDATE_SAMPLER = WeightedSampler(["Y","N","NO","yes"], [0.06,0.78,0.1,0.06])
+ORDER_STATUS_SAMPLER = WeightedSampler(["NEW","PAID","SHIPPED","CANCELLED","new","Shipped"],
+                                       [0.3,0.2,0.25,0.1,0.1,0.05])
+ORDER_STATUS_UPDATE_SAMPLER = WeightedSampler(["NEW","PAID","SHIPPED","CANCELLED","RETURNED"],
+                                              [0.1,0.35,0.35,0.15,0.05])
+ORDER_EXTRA_SAMPLER = WeightedSampler(["", "legacy", None], [0.5,0.3,0.2])
+ITEM_CURRENCY_SAMPLER = WeightedSampler(["EUR","eur","USD"], [0.8,0.1,0.1])
+PAYMENT_METHOD_SAMPLER = WeightedSampler(["CARD","card","CASH","PayPal","Bizum","BIZUM"])
+PAYMENT_STATUS_SAMPLER = WeightedSampler(["OK","ok","FAILED","PENDING"], [0.7,0.1,0.1,0.1])
 
 # ----------------------------- Base Generators -----------------------------
+# Randomness is drawn per column with numpy; each generator returns a Table.
+
+def gen_customers_base(rng: np.random.Generator, n_customers: int, today_dt: datetime,
+                       null_rate: float) -> Table:
+    n = n_customers
+    ids = [next(UUID_POOL) for _ in range(n)]
+    fi, li = random_names(rng, n)
+    emails = random_emails(rng, fi, li)
+    keep_first = (rng.random(n) < 0.7).tolist()
+    keep_last = (rng.random(n) < 0.7).tolist()
+    firsts = pad_spaces(rng, [FIRSTS[i] if k else FIRSTS_UPPER[i] for i, k in zip(fi, keep_first)])
+    lasts = pad_spaces(rng, [LASTS[i] if k else LASTS_LOWER[i] for i, k in zip(li, keep_last)])
+    emails = null_out(rng, pad_spaces(rng, emails), null_rate)
+    phones = null_out(rng, rand_phones(rng, n), null_rate)
+    since = fmt_dates(random_dates(rng, today_dt - timedelta(days=1800), today_dt - timedelta(days=30), n))
+    active = ACTIVE_SAMPLER.sample(rng, n)
+    extra = CUSTOMER_EXTRA_SAMPLER.sample(rng, n)
+    return {
+        "customerId": ids,
+        "firstName": firsts,
+        "lastName": lasts,
+        "emailAddress": emails,
+        "phoneNumber": phones,
+        "customerSince": since,
+        "isActive": active,
+        "extraField1": extra,
+    }
+
+def gen_products_base(rng: np.random.Generator, n_products: int, today_dt: datetime,
+                      null_rate: float) -> Table:
+    n = n_products
+    ids = [next(UUID_POOL) for _ in range(n)]
+    cats = random_categories(rng, n)
+    names = random_product_names(rng, cats)
+    release = fmt_dates(random_dates(rng, today_dt - timedelta(days=2000), today_dt - timedelta(days=10), n))
+    prices = null_out(rng, np.round(rng.uniform(3.0, 800.0, n), 2).astype(np.float32), null_rate)
+    currency = PRODUCT_CURRENCY_SAMPLER.sample(rng, n)
+    discontinued = DISCONTINUED_SAMPLER.sample(rng, n)
+    extra = null_out(rng, ["toBeDropped"] * n, 0.5)
+    return {
+        "productId": ids,
+        "productName": pad_spaces(rng, names),
+        "category": pad_spaces(rng, cats),
+        "unitPrice": prices,
+        "currency": currency,
+        "productReleaseDate": release,
+        "isDiscontinued": discontinued,
+        "extraField2": extra,
+    }
 
-def gen_customers_base(n_customers: int, today_dt: datetime, null_rate: float) -> List[Dict[str, Any]]:
-    rows = []
-    for _ in range(n_customers):
-        first, last = random_name()
-        cid = str(uuid.uuid4())
-        customer_since = random_date(today_dt - timedelta(days=1800), today_dt - timedelta(days=30))
-        email = random_email(first, last)
-        rows.append({
-            "customerId": cid,
-            "firstName": maybe_pad_spaces(first if random.random() < 0.7 else first.upper()),
-            "lastName": maybe_pad_spaces(last if random.random() < 0.7 else last.lower()),
-            "emailAddress": maybe_null(maybe_pad_spaces(email), null_rate),
-            "phoneNumber": maybe_null(rand_phone(), null_rate),
-            "customerSince": customer_since.strftime("%Y-%m-%d"),
-            "isActive": rand_choice_weighted(["Y","N","y","n"], [0.7,0.1,0.15,0.05]),
-            "extraField1": rand_choice_weighted(["", "N/A", "legacy", None], [0.5,0.2,0.2,0.1]),
-        })
-    return rows
-
-def gen_products_base(n_products: int, today_dt: datetime, null_rate: float) -> List[Dict[str, Any]]:
-    rows = []
-    for _ in range(n_products):
-        pid = str(uuid.uuid4())
-        cat = random_category()
-        name = random_product_name(cat)
-        release = random_date(today_dt - timedelta(days=2000), today_dt - timedelta(days=10))
-        price = round(random.uniform(3.0, 800.0), 2)
-        price_val = str(price) if random.random() < 0.2 else price
-        rows.append({
-            "productId": pid,
-            "productName": maybe_pad_spaces(name),
-            "category": maybe_pad_spaces(cat),
-            "unitPrice": maybe_null(price_val, null_rate),
-            "currency": rand_choice_weighted(["EUR","eur","Usd","USD"], [0.7,0.05,0.1,0.15]),
-            "productReleaseDate": release.strftime("%Y-%m-%d"),
-            "isDiscontinued": rand_choice_weighted(["Y","N","NO","yes"], [0.05,0.8,0.1,0.05]),
-            "extraField2": maybe_null("toBeDropped", 0.5),
-        })
-    return rows
-
-def gen_orders_items_base(n_orders: int,
-                          customers: List[Dict[str, Any]],
-                          products: List[Dict[str, Any]],
+def gen_orders_items_base(rng: np.random.Generator,
+                          n_orders: int,
+                          customers: Table,
+                          products: Table,
                           start: datetime,
                           end: datetime,
                           null_rate: float,
-                          orphan_fk_rate: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    orders, items = [], []
-    for _ in range(n_orders):
-        order_id = str(uuid.uuid4())
-        cust = random.choice(customers)
-        customerId = cust["customerId"]
-        order_dt = random_date(start, end)
-        ship_dt  = order_dt + timedelta(days=random.randint(0, 10))
-        status = rand_choice_weighted(["NEW","PAID","SHIPPED","CANCELLED","new","Shipped"], [0.3,0.2,0.25,0.1,0.1,0.05])
-        orders.append({
-            "orderId": order_id,
-            "customerId": maybe_null(customerId, null_rate * 0.5),
-            "orderDate": order_dt.strftime("%Y-%m-%d %H:%M:%S"),
-            "shipDate": ship_dt.strftime("%Y-%m-%d"),
-            "status": status,
-            "shippingAddress": maybe_pad_spaces(f"C/ {random.choice(['Sol','Luna','Mar','Rio'])}, {random.randint(1, 99)}"),
-            "totalAmount": None,
-            "extraField1": rand_choice_weighted(["", "legacy", None], [0.5,0.3,0.2]),
-        })
-        # Items 1..5
-        n_lines = random.randint(1,5)
-        for _line in range(n_lines):
-            prod = random.choice(products)
-            use_orphan = random.random() < orphan_fk_rate
-            product_id = str(uuid.uuid4()) if use_orphan else prod["productId"]
-            qty = random.randint(1, 5)
-            unit_price = prod["unitPrice"]
-            try:
-                unit_price_f = float(unit_price)
-            except Exception:
-                unit_price_f = round(random.uniform(5, 500), 2)
-            amount = round(qty * unit_price_f, 2)
-            items.append({
-                "orderItemId": str(uuid.uuid4()),
-                "orderId": order_id,
-                "productId": maybe_null(product_id, null_rate),
-                "quantity": qty if random.random() > 0.05 else None,
-                "unitPrice": unit_price if random.random() > 0.1 else str(unit_price_f),
-                "lineAmount": amount if random.random() > 0.2 else str(amount),
-                "currency": rand_choice_weighted(["EUR","eur","USD"], [0.8,0.1,0.1]),
-                "holaMundo": maybe_pad_spaces("valor_inutil"),
-            })
+                          orphan_fk_rate: float) -> Tuple[Table, Table]:
+    n = n_orders
+    order_ids = [next(UUID_POOL) for _ in range(n)]
+    cust_ids = [customers["customerId"][i] for i in rng.integers(0, table_len(customers), n).tolist()]
+    order_ts = random_dates(rng, start, end, n)
+    ship_ts = order_ts + rng.integers(0, 11, n).astype("timedelta64[D]")
+    status = ORDER_STATUS_SAMPLER.sample(rng, n)
+    streets = ["Sol","Luna","Mar","Rio"]
+    addresses = [f"C/ {streets[s]}, {num}"
+                 for s, num in zip(rng.integers(0, len(streets), n).tolist(), rng.integers(1, 100, n).tolist())]
+    extra = ORDER_EXTRA_SAMPLER.sample(rng, n)
+    orders = {
+        "orderId": order_ids,
+        "customerId": null_out(rng, cust_ids, null_rate * 0.5),
+        "orderDate": fmt_timestamps(order_ts),
+        "shipDate": fmt_dates(ship_ts),
+        "status": status,
+        "shippingAddress": pad_spaces(rng, addresses),
+        "totalAmount": [None] * n,
+        "extraField1": extra,
+    }
+
+    # Items 1..5 per order
+    n_lines = rng.integers(1, 6, n)
+    m = int(n_lines.sum())
+    item_order = np.repeat(np.arange(n), n_lines).tolist()
+    prod_idx = rng.integers(0, table_len(products), m)
+    orphan = (rng.random(m) < orphan_fk_rate).tolist()
+    qty = rng.integers(1, 6, m).astype(np.int8)
+    fallback = np.round(rng.uniform(5, 500, m), 2).astype(np.float32)
+    # NULL product prices fall back to a random one for the line amount
+    prod_price = products["unitPrice"][prod_idx]
+    unit_price_f = np.where(np.isnan(prod_price), fallback, prod_price)
+    amounts = np.round(qty * unit_price_f, 2).astype(np.float32)
+    prod_idx = prod_idx.tolist()
+    product_ids = [orphan_id() if o else products["productId"][i] for i, o in zip(prod_idx, orphan)]
+    keep_price = rng.random(m) > 0.1
+    currency = ITEM_CURRENCY_SAMPLER.sample(rng, m)
+    items = {
+        "orderItemId": [next(UUID_POOL) for _ in range(m)],
+        "orderId": [order_ids[i] for i in item_order],
+        "productId": null_out(rng, product_ids, null_rate),
+        "quantity": null_out(rng, qty, 0.05),
+        "unitPrice": np.where(keep_price, prod_price, unit_price_f),
+        "lineAmount": amounts,
+        "currency": currency,
+        "holaMundo": pad_spaces(rng, ["valor_inutil"] * m),
+    }
     return orders, items
 
-def gen_payments_base(orders: List[Dict[str, Any]],
+def gen_payments_base(rng: np.random.Generator,
+                      orders: Table,
                       start: datetime, end: datetime,
-                      null_rate: float, orphan_fk_rate: float) -> List[Dict[str, Any]]:
-    methods = ["CARD","card","CASH","PayPal","Bizum","BIZUM"]
-    rows = []
-    for o in orders:
-        if random.random() < 0.85:
-            amount = round(random.uniform(5, 1500), 2)
-            pay_dt = random_date(start, end + timedelta(days=5))
-            use_orphan = random.random() < orphan_fk_rate
-            order_id = str(uuid.uuid4()) if use_orphan else o["orderId"]
-            rows.append({
-                "paymentId": str(uuid.uuid4()),
-                "orderId": maybe_null(order_id, null_rate * 0.5),
-                "paymentMethod": rand_choice_weighted(methods),
-                "amount": amount if random.random() > 0.2 else f"{amount}",
-                "paymentDate": pay_dt.strftime("%Y-%m-%d %H:%M:%S"),
-                "status": rand_choice_weighted(["OK","ok","FAILED","PENDING"], [0.7,0.1,0.1,0.1]),
-            })
-    return rows
+                      null_rate: float, orphan_fk_rate: float) -> Table:
+    paid = [orders["orderId"][i] for i in np.flatnonzero(rng.random(table_len(orders)) < 0.85).tolist()]
+    n = len(paid)
+    amounts = np.round(rng.uniform(5, 1500, n), 2).astype(np.float32)
+    pay_dates = fmt_timestamps(random_dates(rng, start, end + timedelta(days=5), n))
+    orphan = (rng.random(n) < orphan_fk_rate).tolist()
+    order_ids = null_out(rng, [orphan_id() if u else oid for oid, u in zip(paid, orphan)],
+                         null_rate * 0.5)
+    method = PAYMENT_METHOD_SAMPLER.sample(rng, n)
+    status = PAYMENT_STATUS_SAMPLER.sample(rng, n)
+    return {
+        "paymentId": [next(UUID_POOL) for _ in range(n)],
+        "orderId": order_ids,
+        "paymentMethod": method,
+        "amount": amounts,
+        "paymentDate": pay_dates,
+        "status": status,
+    }
 
 # ----------------------------- CDC Utilities -----------------------------
 
-def attach_insert_cdc(rows: List[Dict[str, Any]],
+def attach_insert_cdc(rng: np.random.Generator,
+                      table: Table,
                       file_date: datetime.date,
-                      late_rate: float) -> List[Dict[str, Any]]:
-    out = []
-    for r in rows:
-        rr = r.copy()
-        rr["op"] = "I"
-        rr["seqNum"] = 1
-        ev = day_event_time(file_date)
-        if random.random() < late_rate and random.random() < 0.5:
-            ev = ev - timedelta(days=random.randint(1,2))
-        rr["eventTime"] = ev.strftime("%Y-%m-%d %H:%M:%S")
-        out.append(rr)
-    return out
-
-def make_updates_deletes(previous_rows: List[Dict[str, Any]],
+                      late_rate: float) -> Table:
+    # inserts arrive late with half the configured probability
+    n = table_len(table)
+    table["op"] = ["I"] * n
+    table["eventTime"] = day_event_time_str(rng, file_date, n, late_rate * 0.5)
+    table["seqNum"] = np.ones(n, dtype=np.int16)
+    return table
+
+# Numeric mutation kernels: one array expression per batch of updates
+def _mutate_prices(prices: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    return np.round(prices * factors, 2)
+
+def _mutate_quantities(quantities: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+    return np.clip(quantities + deltas, 1, None)
+
+def jitter_numeric(rng: np.random.Generator, values: np.ndarray, low: float, high: float,
+                   factors: List[float]) -> np.ndarray:
+    # NULL amounts fall back to a random one, then everything is scaled by a random factor
+    k = len(values)
+    base = np.where(np.isnan(values), np.round(rng.uniform(low, high, k), 2), values)
+    return _mutate_prices(base, np.asarray(factors)[rng.integers(0, len(factors), k)]).astype(values.dtype)
+
+def make_updates_deletes(rng: np.random.Generator,
+                         state: Table,
                          file_date: datetime.date,
                          update_rate: float,
                          delete_rate: float,
                          late_rate: float,
-                         table: str) -> List[Dict[str, Any]]:
-    if not previous_rows:
-        return []
-    k_upd = max(1, int(len(previous_rows) * update_rate))
-    k_del = max(0, int(len(previous_rows) * delete_rate))
-    sample_upd = random.sample(previous_rows, k=min(k_upd, len(previous_rows)))
-    sample_del = random.sample(previous_rows, k=min(k_del, len(previous_rows)))
-
-    out = []
-
-    # Updates
-    for r in sample_upd:
-        u = r.copy()
-        u["op"] = "U"
-        u["seqNum"] = r.get("seqNum", 1) + 1
-        # mutate meaningful fields
-        if table == "customers":
-            if u.get("emailAddress"):
-                u["emailAddress"] = u["emailAddress"].replace("@", f"+u{random.randint(1,9)}@")
-            u["isActive"] = rand_choice_weighted(["Y","N","y","n"], [0.7,0.1,0.15,0.05])
-        elif table == "products":
-            # tweak price 5% up/down if numeric
-            try:
-                p = float(u.get("unitPrice"))
-            except Exception:
-                p = round(random.uniform(5, 500), 2)
-            u["unitPrice"] = round(p * random.choice([0.95, 1.00, 1.05]), 2)
-            u["isDiscontinued"] = rand_choice_weighted(["Y","N","NO","yes"], [0.06,0.78,0.1,0.06])
-        elif table == "orders":
-            u["status"] = rand_choice_weighted(["NEW","PAID","SHIPPED","CANCELLED","RETURNED"], [0.1,0.35,0.35,0.15,0.05])
-        elif table == "orderItems":
-            # change quantity or price slightly
-            q = u.get("quantity")
-            if isinstance(q, int) and q is not None:
-                u["quantity"] = max(1, q + random.choice([-1, 0, 1]))
-            try:
-                up = float(u.get("unitPrice"))
-            except Exception:
-                up = round(random.uniform(5, 500), 2)
-            u["unitPrice"] = round(up * random.choice([0.95, 1.0, 1.05]), 2)
-        elif table == "payments":
-            try:
-                amt = float(u.get("amount"))
-            except Exception:
-                amt = round(random.uniform(5, 1500), 2)
-            u["amount"] = round(amt * random.choice([0.9, 1.0, 1.1]), 2)
-            u["status"] = rand_choice_weighted(["OK","ok","FAILED","PENDING"], [0.7,0.1,0.1,0.1])
-        ev = day_event_time(file_date)
-        if random.random() < late_rate:
-            ev = ev - timedelta(days=random.randint(1,2))
-        u["eventTime"] = ev.strftime("%Y-%m-%d %H:%M:%S")
-        out.append(u)
+                         table: str) -> Table:
+    n = table_len(state)
+    if n == 0:
+        return take(state, [])
+    k_upd = min(max(1, int(n * update_rate)), n)
+    k_del = min(max(0, int(n * delete_rate)), n)
+    upd = take(state, rng.choice(n, size=k_upd, replace=False).tolist())
+    dels = take(state, rng.choice(n, size=k_del, replace=False).tolist())
+
+    # Updates: mutate meaningful columns as a whole
+    if table == "customers":
+        tags = rng.integers(1, 10, k_upd).tolist()
+        upd["emailAddress"] = [e.replace("@", f"+u{t}@") if e else e for e, t in zip(upd["emailAddress"], tags)]
+        upd["isActive"] = ACTIVE_SAMPLER.sample(rng, k_upd)
+    elif table == "products":
+        # tweak price 5% up/down if numeric
+        upd["unitPrice"] = jitter_numeric(rng, upd["unitPrice"], 5, 500, [0.95, 1.00, 1.05])
+        upd["isDiscontinued"] = DISCONTINUED_UPDATE_SAMPLER.sample(rng, k_upd)
+    elif table == "orders":
+        upd["status"] = ORDER_STATUS_UPDATE_SAMPLER.sample(rng, k_upd)
+    elif table == "orderItems":
+        # change quantity or price slightly
+        qty = upd["quantity"]
+        new_qty = _mutate_quantities(qty, rng.integers(-1, 2, k_upd, dtype=np.int8))
+        upd["quantity"] = np.where(qty == 0, qty, new_qty)  # NULL quantities stay NULL
+        upd["unitPrice"] = jitter_numeric(rng, upd["unitPrice"], 5, 500, [0.95, 1.0, 1.05])
+    elif table == "payments":
+        upd["amount"] = jitter_numeric(rng, upd["amount"], 5, 1500, [0.9, 1.0, 1.1])
+        upd["status"] = PAYMENT_STATUS_SAMPLER.sample(rng, k_upd)
+    upd["op"] = ["U"] * k_upd
+    upd["eventTime"] = day_event_time_str(rng, file_date, k_upd, late_rate)
+    upd["seqNum"] = upd["seqNum"] + 1
 
     # Deletes
-    for r in sample_del:
-        d = {k: r[k] for k in r.keys()}
-        d["op"] = "D"
-        d["seqNum"] = r.get("seqNum", 1) + 1
-        ev = day_event_time(file_date)
-        d["eventTime"] = ev.strftime("%Y-%m-%d %H:%M:%S")
-        out.append(d)
-
-    return out
+    dels["op"] = ["D"] * k_del
+    dels["eventTime"] = day_event_time_str(rng, file_date, k_del)
+    dels["seqNum"] = dels["seqNum"] + 1
+
+    extend_table(upd, dels)
+    return upd
+
+# ----------------------------- Output -----------------------------
+
+def write_all(out_dir: str, tables: Dict[str, Table], fmt: str) -> None:
+    # the writers and file I/O run side by side, one thread per table
+    with ThreadPoolExecutor(max_workers=len(tables)) as pool:
+        list(pool.map(lambda t: write_table(out_dir, t, tables[t], fmt), tables))
+
+def emit_cdc_days(table: str,
+                  state: Table,
+                  seed: np.random.SeedSequence,
+                  day1_date: datetime.date,
+                  cdc_days: int,
+                  output_dir: str,
+                  update_rate: float,
+                  delete_rate: float,
+                  late_rate: float,
+                  fmt: str) -> None:
+    # Whole U/D chain of one table (days 2..cdc_days). Tables are independent, so each
+    # chain runs in its own process with its own seed; days stay sequential because
+    # every day samples from the state left by the previous one.
+    rng = np.random.default_rng(seed)
+    for d in range(2, cdc_days + 1):
+        file_date = day1_date + timedelta(days=d-1)
+        mut = make_updates_deletes(rng, state, file_date, update_rate, delete_rate, late_rate, table)
+        # Note: we append mutations as the "latest known state" for subsequent days
+        # (so next day can keep seqNum chain). extend() avoids an O(days^2) copy.
+        extend_table(state, mut)
+        # Write ONLY mutations for the day (as typical CDC feeds)
+        write_table(os.path.join(output_dir, str(file_date)), table, mut, fmt)
 
 # ----------------------------- Main -----------------------------
 
@@ -328,9 +538,15 @@ def main():
     parser.add_argument("--orphan-fk-rate", type=float, default=0.03, help="Probability to emit orphan FKs")
 
     parser.add_argument("--include-payments", action="store_true", help="Generate payments table")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used to emit the per-table CDC days")
+    parser.add_argument("--format", choices=["csv","parquet","both"], default="both",
+                        help="Output files per table: CSV, Parquet (zstd) or both")
 
     args = parser.parse_args()
-    random.seed(args.seed)
+    if args.format != "csv" and pa is None:
+        parser.error("--format parquet/both requires pyarrow (pip install pyarrow) or use --format csv")
+    rng = np.random.default_rng(args.seed)
 
     # Day references
     today = datetime.utcnow().date()
@@ -343,93 +559,59 @@ def main():
     base_out_dir = os.path.join(args.output_dir, str(day1_date))
     ensure_dir(base_out_dir)
 
-    customers_base = gen_customers_base(args.customers, datetime.utcnow(), args.null_rate)
-    products_base  = gen_products_base(args.products, datetime.utcnow(), args.null_rate)
-    orders_base, items_base = gen_orders_items_base(args.orders, customers_base, products_base,
+    customers_base = gen_customers_base(rng, args.customers, datetime.utcnow(), args.null_rate)
+    products_base  = gen_products_base(rng, args.products, datetime.utcnow(), args.null_rate)
+    orders_base, items_base = gen_orders_items_base(rng, args.orders, customers_base, products_base,
                                                     start_orders, end_orders,
                                                     args.null_rate, args.orphan_fk_rate)
-    payments_base = gen_payments_base(orders_base, start_orders, end_orders,
-                                      args.null_rate, args.orphan_fk_rate) if args.include_payments else []
+    payments_base = gen_payments_base(rng, orders_base, start_orders, end_orders,
+                                      args.null_rate, args.orphan_fk_rate) if args.include_payments else None
 
     # Duplicates only in day 1 (to clean in Bronze/Silver)
-    customers_day1 = duplicate_rows(customers_base, args.dupe_rate)
-    products_day1  = duplicate_rows(products_base,  args.dupe_rate * 0.5)
-    orders_day1    = duplicate_rows(orders_base,    args.dupe_rate * 0.3)
-    items_day1     = duplicate_rows(items_base,     args.dupe_rate * 0.2)
-    payments_day1  = duplicate_rows(payments_base,  args.dupe_rate * 0.2) if payments_base else []
+    customers_day1 = duplicate_rows(rng, customers_base, args.dupe_rate)
+    products_day1  = duplicate_rows(rng, products_base,  args.dupe_rate * 0.5)
+    orders_day1    = duplicate_rows(rng, orders_base,    args.dupe_rate * 0.3)
+    items_day1     = duplicate_rows(rng, items_base,     args.dupe_rate * 0.2)
+    payments_day1  = duplicate_rows(rng, payments_base,  args.dupe_rate * 0.2) if payments_base else None
 
     # Attach CDC (I, seq=1, eventTime possibly late)
-    customers_day1 = attach_insert_cdc(customers_day1, day1_date, args.late_rate)
-    products_day1  = attach_insert_cdc(products_day1,  day1_date, args.late_rate)
-    orders_day1    = attach_insert_cdc(orders_day1,    day1_date, args.late_rate)
-    items_day1     = attach_insert_cdc(items_day1,     day1_date, args.late_rate)
-    if payments_day1:
-        payments_day1 = attach_insert_cdc(payments_day1, day1_date, args.late_rate)
+    customers_day1 = attach_insert_cdc(rng, customers_day1, day1_date, args.late_rate)
+    products_day1  = attach_insert_cdc(rng, products_day1,  day1_date, args.late_rate)
+    orders_day1    = attach_insert_cdc(rng, orders_day1,    day1_date, args.late_rate)
+    items_day1     = attach_insert_cdc(rng, items_day1,     day1_date, args.late_rate)
+    if payments_day1 is not None:
+        payments_day1 = attach_insert_cdc(rng, payments_day1, day1_date, args.late_rate)
 
     # Write Day 1
-    def write_all(out_dir: str,
-                  customers_rows, products_rows, orders_rows, items_rows, payments_rows):
-        write_csv(os.path.join(out_dir, "customers.csv"), customers_rows, [
-            "customerId","firstName","lastName","emailAddress","phoneNumber","customerSince","isActive","extraField1",
-            "op","eventTime","seqNum"
-        ])
-        write_csv(os.path.join(out_dir, "products.csv"), products_rows, [
-            "productId","productName","category","unitPrice","currency","productReleaseDate","isDiscontinued","extraField2",
-            "op","eventTime","seqNum"
-        ])
-        write_csv(os.path.join(out_dir, "orders.csv"), orders_rows, [
-            "orderId","customerId","orderDate","shipDate","status","shippingAddress","totalAmount","extraField1",
-            "op","eventTime","seqNum"
-        ])
-        write_csv(os.path.join(out_dir, "orderItems.csv"), items_rows, [
-            "orderItemId","orderId","productId","quantity","unitPrice","lineAmount","currency","holaMundo",
-            "op","eventTime","seqNum"
-        ])
-        if payments_rows is not None:
-            write_csv(os.path.join(out_dir, "payments.csv"), payments_rows, [
-                "paymentId","orderId","paymentMethod","amount","paymentDate","status",
-                "op","eventTime","seqNum"
-            ])
-
-    write_all(base_out_dir, customers_day1, products_day1, orders_day1, items_day1,
-              payments_day1 if args.include_payments else None)
-
-    # Keep last emitted states to build U/D on top (seqNum will increase)
-    last_customers = customers_day1
-    last_products  = products_day1
-    last_orders    = orders_day1
-    last_items     = items_day1
-    last_payments  = payments_day1 if args.include_payments else []
+    day1_tables = {
+        "customers": customers_day1,
+        "products": products_day1,
+        "orders": orders_day1,
+        "orderItems": items_day1,
+    }
+    if args.include_payments:
+        day1_tables["payments"] = payments_day1
+    write_all(base_out_dir, day1_tables, args.format)
 
     # ---------- Subsequent CDC days: only mutations (U/D) ----------
+    # Day-1 tables are the starting state of each table's chain (seqNum will increase)
     for d in range(2, args.cdc_days + 1):
-        file_date = day1_date + timedelta(days=d-1)
-        out_dir = os.path.join(args.output_dir, str(file_date))
-        ensure_dir(out_dir)
-
-        cust_mut = make_updates_deletes(last_customers, file_date, args.update_rate, args.delete_rate, args.late_rate, "customers")
-        prod_mut = make_updates_deletes(last_products,  file_date, args.update_rate, args.delete_rate, args.late_rate, "products")
-        ord_mut  = make_updates_deletes(last_orders,    file_date, args.update_rate, args.delete_rate, args.late_rate, "orders")
-        itm_mut  = make_updates_deletes(last_items,     file_date, args.update_rate, args.delete_rate, args.late_rate, "orderItems")
-        pay_mut  = make_updates_deletes(last_payments,  file_date, args.update_rate, args.delete_rate, args.late_rate, "payments") \
-                   if args.include_payments else []
-
-        # Update "last_*" to include emitted mutations (so next day can keep seqNum chain)
-        # Note: we append mutations as the "latest known state" for subsequent days
-        last_customers = last_customers + cust_mut
-        last_products  = last_products + prod_mut
-        last_orders    = last_orders + ord_mut
-        last_items     = last_items + itm_mut
-        if args.include_payments:
-            last_payments = last_payments + pay_mut
-
-        # Write ONLY mutations for the day (as typical CDC feeds)
-        write_all(out_dir, cust_mut, prod_mut, ord_mut, itm_mut, pay_mut if args.include_payments else None)
+        ensure_dir(os.path.join(args.output_dir, str(day1_date + timedelta(days=d-1))))
+    if args.cdc_days > 1:
+        seeds = np.random.SeedSequence(args.seed).spawn(len(day1_tables))
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(day1_tables))) as pool:
+            futures = [
+                pool.submit(emit_cdc_days, table, state, seed, day1_date, args.cdc_days, args.output_dir,
+                            args.update_rate, args.delete_rate, args.late_rate, args.format)
+                for (table, state), seed in zip(day1_tables.items(), seeds)
+            ]
+            for f in futures:
+                f.result()
 
     print("Generation complete.")
     print(f"Base day: {day1_date}  |  CDC days total: {args.cdc_days}")
     print(f"Output root: {args.output_dir}")
-    print("Each date folder contains CSVs with camelCase + CDC columns (op, eventTime, seqNum).")
+    print(f"Each date folder contains {args.format} files with camelCase + CDC columns (op, eventTime, seqNum).")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,7 @@
 from tools.config import CHECKPOINTS_ROOT, CATALOG, VOLUME_LANDING_ROOT
 from pyspark.sql import SparkSession, DataFrame
 from pyspark.sql import functions as F
-from pyspark.sql import Window as W
+from pyspark.sql.types import StructType
 
 # --------------------------------------
 # AUTOLOADER
@@ -17,14 +17,34 @@ def helper_autoloader(
     header: bool = False,
     multi_line: bool = False,
     metadata: bool = False,
+    use_notifications: bool = False,
+    max_files_per_trigger: int = 1000,
+    max_bytes_per_trigger: str = "1g",
+    schema: StructType | None = None,
 ):
     
-    df = (spark_session.readStream
+    # use_notifications: eventos de ficheros en lugar de listar el directorio en
+    # cada micro-batch (requiere permisos para crear la cola/suscripción).
+    reader = (spark_session.readStream
         .format("cloudFiles")
         .option("cloudFiles.format", file_type)
         .option("cloudFiles.schemaEvolutionMode", "rescue")
-        .option("cloudFiles.inferColumnTypes", "true")
+    )
+
+    # Con esquema explícito (o Parquet, que ya lo trae) no hay pasada de inferencia.
+    if schema is not None:
+        reader = reader.schema(schema)
+    elif file_type != "parquet":
+        reader = reader.option("cloudFiles.inferColumnTypes", "true")
+
+    # El generador deja .csv y .parquet en la misma carpeta: leer solo los del formato.
+    df = (reader
+        .option("pathGlobFilter", f"*.{file_type}")
         .option("cloudFiles.schemaLocation", schema_loc)
+        .option("cloudFiles.useNotifications", str(use_notifications).lower())
+        .option("cloudFiles.includeExistingFiles", "true")
+        .option("cloudFiles.maxFilesPerTrigger", str(max_files_per_trigger))
+        .option("cloudFiles.maxBytesPerTrigger", max_bytes_per_trigger)
         .option("header", str(header).lower())
         .option("multiLine", str(multi_line).lower())
         .load(input_path)
@@ -53,9 +73,21 @@ def helper_autoloader(
 def dedup_by(
     spark_session: SparkSession,
     df: DataFrame,
-    *keys: str
+    *keys: str,
+    event_time_col: str | None = None,
+    watermark: str = "1 hour",
 ):
-    return df.dropDuplicates(list(keys) if keys else df.columns)
+    subset = list(keys) if keys else df.columns
+
+    # En streaming, dropDuplicates guarda estado para siempre; con watermark el
+    # estado se purga. En batch Spark ya lo ejecuta como groupBy(keys) + first().
+    if df.isStreaming and event_time_col:
+        return (
+            df.withWatermark(event_time_col, watermark)
+            .dropDuplicatesWithinWatermark(subset)
+        )
+
+    return df.dropDuplicates(subset)
 
 def normalize_cdc_latest(
     spark_session: SparkSession,
@@ -66,18 +98,19 @@ def normalize_cdc_latest(
     tiebreakers: list[str] | None = None,
 ):
     tiebreakers = tiebreakers or []
-    
-    base = dedup_by(spark_session, df)
 
-    order_exprs = [
-        F.col(seq_col).desc_nulls_last(),
-        F.col(ts_col).desc_nulls_last()
-    ] + [F.col(c).desc_null_lasts() for c in tiebreakers]
+    # max(struct) compara campo a campo de izquierda a derecha (NULL como menor):
+    # seq desc, ts desc, tiebreakers desc. Un solo groupBy en lugar de Window + sort.
+    order_cols = [seq_col, ts_col] + [c for c in tiebreakers if c not in (seq_col, ts_col)]
+    payload_cols = [c for c in df.columns if c != key_col and c not in order_cols]
+    latest_struct = F.struct(*[F.col(c) for c in order_cols + payload_cols])
 
-    w = W.partitionBy(key_col).orderBy(*order_exprs)
-
-    ranked = base.withColumn("_rn", F.row_number().over(w))
-    latest = ranked.filter(F.col("_rn") == 1).drop("_rn")
+    latest = (
+        df.groupBy(key_col)
+        .agg(F.max(latest_struct).alias("_latest"))
+        .select(key_col, "_latest.*")
+        .select(*df.columns)
+    )
 
     return latest
 